@@ -22,36 +22,46 @@ Example usage:
 
 """
 import argparse
+from collections import defaultdict
 import re
 import sys
 
+_VIOLATE_RE = re.compile(r"^(?P<filename>.*?)(?::(?P<line_number>\d+))? violates (?P<rule>.*)\Z")
 
-def insert_at_line(filename, line_number, string):
-    """This is wildly inefficient, but we our use case is pretty small."""
+
+def rewrite_file(filename, insertions):
+    """Insert all strings into a file with a single read and a single write.
+
+    Insertions are applied in the order given, so callers should pass them
+    bottom-up to keep the line numbers of the original file valid.
+
+    """
     with open(filename, "r") as f:
         contents = f.readlines()
 
-    contents.insert(line_number, string)
+    for line_number, string in insertions:
+        contents.insert(line_number, string)
 
     with open(filename, "w") as f:
-        contents = "".join(contents)
-        f.write(contents)
+        f.write("".join(contents))
 
 
 def main(tool_name):
     """Read stdin and waive all violations by editing source files with pragmas."""
-    violate_re = re.compile("^(?P<filename>.*?)(:(?P<line_number>[0-9]+)){0,1} violates (?P<rule>.*)")
-
-    lines = sys.stdin.readlines()
-
-    re_matches = [violate_re.match(l) for l in lines]
-    matches = [m for m in re_matches if m]
-
-    errors = sorted([(m.group('filename'), int(m.group('line_number')), m.group('rule')) for m in matches])
-
-    for filename, line_number, error in reversed(errors):
-        insert_at_line(filename, line_number + 1, f"// {tool_name}: enable={error}\n")
-        insert_at_line(filename, line_number, f"// {tool_name}: disable={error}\n")
+    matches = (_VIOLATE_RE.match(l.rstrip("\n")) for l in sys.stdin)
+    # The line number is left out of the report for violations on the first line
+    errors = sorted((m.group('filename'), int(m.group('line_number') or 0), m.group('rule')) for m in matches if m)
+
+    by_file = defaultdict(list)
+    for filename, line_number, error in errors:
+        by_file[filename].append((line_number, error))
+
+    for filename, violations in by_file.items():
+        insertions = []
+        for line_number, error in reversed(violations):
+            insertions.append((line_number + 1, f"// {tool_name}: enable={error}\n"))
+            insertions.append((line_number, f"// {tool_name}: disable={error}\n"))
+        rewrite_file(filename, insertions)
 
 
 if __name__ == '__main__':
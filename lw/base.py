@@ -71,21 +71,45 @@ class Broadcaster(Base): # pylint: disable=too-few-public-methods
     # key : Broadcaster class
     listener_registry = defaultdict(list)
 
+    # Name of the update function this Broadcaster calls in its listeners.
+    # Computed once per class in __init_subclass__ since it is needed on every broadcast.
+    _listener_function_name = "update_"
+
+    # Tuple snapshot of listener_registry[cls] set by freeze_registries, None if not frozen
+    _frozen_listeners = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._listener_function_name = "update_{}".format(cls.__name__.lower().replace('broadcaster', ''))
+        cls._frozen_listeners = None
+
     @classmethod
     def listener_function_name(cls):
-        return "update_{}".format(cls.__name__.lower().replace('broadcaster', ''))
+        return cls._listener_function_name
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.listener_instances = []
+        # (listener, update method) pairs resolved once at creation so broadcast()
+        # does not look up the method on every line
+        self._bound_updates = []
         self.disabled_rules = kwargs.pop("disabled_rules", [])
         if 'created_instances' not in kwargs:
             kwargs['created_instances'] = {}
+        # Flat class name -> listener lookup for get_listener, only built on the root
+        self._listener_index = None
         self._create_listener_instances(*args, **kwargs)
+        if self.parent is None:
+            self._listener_index = {}
+            for listener in self._walk_listeners():
+                self._listener_index.setdefault(listener.__class__.__name__, listener)
 
     def _create_listener_instances(self, *args, **kwargs):
         """Create all the subscribed listeners for this broadcaster."""
-        for listener_class in self.__class__.listener_registry[self.__class__]:
+        listener_classes = self._frozen_listeners
+        if listener_classes is None:
+            listener_classes = self.listener_registry[self.__class__]
+        for listener_class in listener_classes:
             if 'restrictions' in kwargs:
                 # For unittesting it simplifies mocking if not all listeners
                 # are built (test cases don't have to adhere to all rules)
@@ -99,31 +123,45 @@ class Broadcaster(Base): # pylint: disable=too-few-public-methods
                 kwargs['created_instances'][listener_class] = new_listener
             self.listener_instances.append(new_listener)
 
+            self._bound_updates.append((new_listener, getattr(new_listener, self._listener_function_name)))
+
     def _broadcast(self, function_name, *args):
         """Echo args to all subscribed listeners."""
         for listener in self.listener_instances:
+            # Only update_* methods are checked at registration, so other
+            # callbacks like eof may still be missing here
             try:
                 listener_function = getattr(listener, function_name)
             except AttributeError as exc:
                 raise IllegalListenerError("{} subscribed to {} but does not have a {} method.".format(
                     listener.__class__, self.__class__, function_name)) from exc
-            if listener_function is not None:
-                listener_function(*args)
+            listener_function(*args)
 
     def broadcast(self, *args):
-        listener_function_name = self.listener_function_name()
-        self._broadcast(listener_function_name, *args)
+        broadcaster_class = self.__class__
+        for listener, update_method in self._bound_updates:
+            if broadcaster_class not in listener._ignored_broadcasters:
+                update_method(*args)
+
+    def _walk_listeners(self):
+        """Yield all listeners below this broadcaster, depth first."""
+        for listener in self.listener_instances:
+            yield listener
+            if isinstance(listener, Broadcaster):
+                yield from listener._walk_listeners()
 
     def get_listener(self, listener_name, broadcaster=None):
         if not broadcaster:
+            root = self
+            while root.parent is not None:
+                root = root.parent
+            if root._listener_index is not None:
+                return root._listener_index.get(listener_name)
+            # Still constructing the tree, fall back to searching it
             broadcaster = self
-        for listener in broadcaster.listener_instances:
+        for listener in broadcaster._walk_listeners():
             if listener_name == listener.__class__.__name__:
                 return listener
-            if isinstance(listener, Broadcaster):
-                gl = self.get_listener(listener_name, listener)
-                if gl:
-                    return gl
         return None
 
 
@@ -163,9 +201,16 @@ class ListenerMeta(type):
                                        new_class.__name__)
         for subscription in new_class.subscribe_to:
             try:
-                subscription.listener_registry[subscription].append(new_class)
+                subscribers = subscription.listener_registry[subscription]
             except AttributeError:
                 raise IllegalListenerError("%s is not a valid Broadcaster to use in subscribe_to field." % subscription)
+            # Checked once here so broadcasting never has to handle a missing method
+            function_name = subscription._listener_function_name
+            if not callable(getattr(new_class, function_name, None)):
+                raise IllegalListenerError("%s subscribed to %s but does not have a %s method." %
+                                           (new_class, subscription, function_name))
+            subscribers.append(new_class)
+            subscription._frozen_listeners = None
 
 
 class Listener(Base, metaclass=ListenerMeta): # pylint: disable=too-few-public-methods
@@ -179,14 +224,15 @@ class Listener(Base, metaclass=ListenerMeta): # pylint: disable=too-few-public-m
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._ignored_broadcasters = {}
+        # Broadcaster classes whose updates are currently skipped for this listener
+        self._ignored_broadcasters = set()
         self._globally_disabled = False
 
     def _ignore(self, broadcaster_class):
         """Stop subscribing to a particular broadcaster.
 
-        This nullifies the corresponding update_* function and squirrels it
-        away in another variable. The _pay_attention method is the counterpart to
+        Broadcasters skip this listener while its class is in
+        _ignored_broadcasters. The _pay_attention method is the counterpart to
         this method.
 
         Parameters
@@ -201,9 +247,7 @@ class Listener(Base, metaclass=ListenerMeta): # pylint: disable=too-few-public-m
             if not self._globally_disabled:
                 raise IllegalListenerError("{} previously ignored by {}".format(broadcaster_class, self))
 
-        update_method = getattr(self, broadcaster_class.listener_function_name())
-        setattr(self, broadcaster_class.listener_function_name(), None)
-        self._ignored_broadcasters[broadcaster_class] = update_method
+        self._ignored_broadcasters.add(broadcaster_class)
 
     def _pay_attention_to(self, broadcaster_class):
         """Renew a subscription to a broadcaster that was previously ignored.
@@ -224,8 +268,7 @@ class Listener(Base, metaclass=ListenerMeta): # pylint: disable=too-few-public-m
 
         if broadcaster_class not in self._ignored_broadcasters:
             raise IllegalListenerError("{} was not previously ignored by {}".format(broadcaster_class, self))
-        setattr(self, broadcaster_class.listener_function_name(), self._ignored_broadcasters[broadcaster_class])
-        del self._ignored_broadcasters[broadcaster_class]
+        self._ignored_broadcasters.remove(broadcaster_class)
 
     def disable(self):
         for bc in self.subscribe_to:
@@ -240,22 +283,68 @@ class Listener(Base, metaclass=ListenerMeta): # pylint: disable=too-few-public-m
         self.disable()
 
 
-def glob_import_rules(filename, ignored_rules=[]):
+def freeze_registries():
+    """Snapshot the listeners of every Broadcaster into a tuple.
+
+    Call this once all rules are imported. Registering another Listener later
+    unfreezes the broadcasters it subscribes to.
+
+    """
+    for broadcaster_class, listener_classes in Broadcaster.listener_registry.items():
+        broadcaster_class._frozen_listeners = tuple(listener_classes)
+
+
+# Rule directory -> list of (source path, module name) found in it
+_glob_cache = {}
+
+# Absolute rule source path -> module already executed by import_rule_file
+_loaded = {}
+
+
+def _find_rule_srcs(lib_dir):
+    try:
+        return _glob_cache[lib_dir]
+    except KeyError:
+        pass
+    rule_srcs = []
+    for src in glob.glob(os.path.join(lib_dir, "*.py")):
+        mod = os.path.splitext(os.path.basename(src))[0]
+        if mod in ["__init__"]:
+            continue
+        rule_srcs.append((os.path.abspath(src), mod))
+    _glob_cache[lib_dir] = rule_srcs
+    return rule_srcs
+
+
+def import_rule_file(filename):
+    """Execute a rule or rule config file and return its module.
+
+    Each file is only executed once, later calls return the same module. This
+    keeps the Listeners it defines from being registered more than once.
+
+    """
+    abs_filename = os.path.abspath(filename)
+    try:
+        return _loaded[abs_filename]
+    except KeyError:
+        pass
+    spec = importlib.util.spec_from_file_location(abs_filename, abs_filename)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    _loaded[abs_filename] = mod
+    return mod
+
+
+def glob_import_rules(filename, ignored_rules=None):
     abs_filename = os.path.abspath(filename)
     lib_dir = os.path.dirname(abs_filename)
-    srcs = glob.glob(os.path.join(lib_dir, "*.py"))
-    for src in srcs:
-        if os.path.abspath(src) == abs_filename:
-            continue
-        mod = src.split("/")[-1].replace(".py", "")
-        if mod in ["__init__"]:
+    for src, mod in _find_rule_srcs(lib_dir):
+        if src == abs_filename:
             continue
         # rule = "".join([c.capitalize() for c in mod.split("_")])
         # if rule in ignored_rules:
         #     continue
-        spec = importlib.util.spec_from_file_location(src, src)
-        foo = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(foo)
+        foo = import_rule_file(src)
         # if rule in ["Filters"]:
         #     continue
         # print(rule)
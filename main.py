@@ -1,9 +1,33 @@
 import argparse
-import importlib.util
+import concurrent.futures
+import io
+import itertools
 import logging
+import os
 import sys
 
-from lw.base import glob_import_rules
+from lw.base import freeze_registries, glob_import_rules, import_rule_file
+from lw.linebase import unicode_error
+
+# Rules loaded in this process, used by _run_file in worker processes
+_worker_state = {}
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler that does not flush the stream after every record.
+
+    Reports can contain thousands of violations, flushing each one costs a
+    write() call. The stream is flushed by logging.shutdown at exit instead.
+
+    """
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
 
 
 class ReportServer(object):
@@ -14,45 +38,72 @@ class ReportServer(object):
 
         self.error_count = 0
 
+        indent = "  "
+        self._reason_tmpl = f"\n{indent}Reason:\n{indent}{indent}{{}}"
+        self._code_tmpl = f"\n{indent}Offending Code:\n{indent}{indent}>{{}}"
+        self._motivation_tmpl = f"\n{indent}Motivation:\n{indent}{indent}{{}}"
+
     @staticmethod
     def _setup_log():
         log = logging.getLogger("lw")
-        handler = logging.StreamHandler(sys.stdout)
+        handler = BufferedStreamHandler(sys.stdout)
         log.addHandler(handler)
         return log
 
     def error(self, listener, line_no, line, message):
         self.error_count += 1
-        if not line_no:
-            line_no = ""
-        else:
-            line_no = ":{}".format(line_no)
-        display_filename = "{}{}".format(listener.filename, line_no)
-        subsequent_indent = "  "
-
+        listener_class = listener.__class__
+        display_filename = f"{listener.filename}:{line_no}" if line_no else listener.filename
+        parts = [display_filename, " violates ", listener_class.__name__]
+        if message:
+            parts.append(self._reason_tmpl.format(message))
         if line:
-            line = "\n{0}Offending Code:\n{0}{0}>{1}".format(subsequent_indent, line.rstrip())
-        else:
-            line = ""
+            parts.append(self._code_tmpl.format(line.rstrip()))
+        if self.display_motivation and listener_class.__doc__:
+            parts.append(self._motivation_tmpl.format(listener_class.__doc__))
 
-        if message:
-            reason = "\n{0}Reason:\n{0}{0}{1}".format(subsequent_indent, message)
-        else:
-            reason = ""
+        self._report("".join(parts))
+
+    def _report(self, message):
+        self.log.error(message)
+
+    def replay(self, error_count, messages):
+        """Report errors collected by a CollectingReportServer in another process."""
+        self.error_count += error_count
+        for message in messages:
+            self._report(message)
 
-        if self.display_motivation and listener.__class__.__doc__:
-            motivation = "\n{0}Motivation:\n{0}{0}{1}".format(subsequent_indent, listener.__class__.__doc__)
-        else:
-            motivation = ""
 
-        self.log.error("%s violates %s%s%s%s", display_filename, listener.__class__.__name__, reason, line, motivation)
+class CollectingReportServer(ReportServer):
+    """Keep formatted errors in memory so a worker process can return them."""
+
+    def __init__(self, display_motivation=True):
+        super().__init__(display_motivation)
+        self.messages = []
+
+    @staticmethod
+    def _setup_log():
+        return None
+
+    def _report(self, message):
+        self.messages.append(message)
+
+
+def _jobs_count(value):
+    try:
+        jobs = int(value)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        raise argparse.ArgumentTypeError("must be an integer of at least 1, got {!r}".format(value))
+    return jobs
 
 
 class GlobalConfig(object):
 
-    def __init__(self, argv):
-        self.options = self.parse_args(argv)
-        self.rs = ReportServer(display_motivation=self.options.display_motivation)
+    def __init__(self, argv, options=None, report_server_class=ReportServer):
+        self.options = options if options is not None else self.parse_args(argv)
+        self.rs = report_server_class(display_motivation=self.options.display_motivation)
 
     @staticmethod
     def parse_args(argv):
@@ -84,28 +135,60 @@ class GlobalConfig(object):
                             action='store_true',
                             default=False,
                             help="Display motivation behind each violated rule.")
+        parser.add_argument('-j',
+                            '--jobs',
+                            dest='jobs',
+                            type=_jobs_count,
+                            default=None,
+                            help=("Number of processes used to check files. "
+                                  "Defaults to the number of CPUs, 1 checks files serially."))
         return parser.parse_args()
 
 
 def main(argv):
     gc = GlobalConfig(argv)
 
-    ignored_rules = gc.options.ignored_rules
+    ignored_rules = set(gc.options.ignored_rules)
 
     for igrc in gc.options.ignored_rule_config:
         with open(igrc) as rfh:
-            for line in rfh.read().splitlines():
+            for line in rfh:
                 line = line.strip().split(" ")[0]
-                if any([line.startswith("#"), line.startswith("//"), line.strip() == ""]):
+                if not line or line.startswith(("#", "//")):
                     continue
-                if line not in ignored_rules:
-                    ignored_rules.append(line)
+                ignored_rules.add(line)
+
+    top_broadcasters = _load_top_broadcasters(gc.options.rule_config, ignored_rules)
+
+    # Ignore temporary files
+    files = [fname for fname in gc.options.files if not fname.endswith('~')]
+
+    # Never start more workers than there are files to check
+    jobs = min(gc.options.jobs or os.cpu_count() or 1, len(files))
+    if jobs <= 1:
+        for fname in files:
+            _lint_file(fname, top_broadcasters, gc, ignored_rules)
+    else:
+        # Forked workers inherit the loaded rules, others load them on their first file
+        _worker_state["top_broadcasters"] = top_broadcasters
+        # A few chunks per worker batches the IPC without leaving workers idle at the end
+        chunksize = max(1, len(files) // (jobs * 4))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = executor.map(_run_file,
+                                   files,
+                                   itertools.repeat(gc.options),
+                                   itertools.repeat(ignored_rules),
+                                   chunksize=chunksize)
+            for error_count, messages in results:
+                gc.rs.replay(error_count, messages)
+
+    return gc.rs.error_count > 0
 
+
+def _load_top_broadcasters(rule_configs, ignored_rules):
     top_broadcasters = []
-    for rc in gc.options.rule_config:
-        spec = importlib.util.spec_from_file_location(rc, rc)
-        mod = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(mod)
+    for rc in rule_configs:
+        mod = import_rule_file(rc)
         # print(rc)
         glob_import_rules(rc, ignored_rules)
 
@@ -113,16 +196,28 @@ def main(argv):
             top_broadcasters.append(mod.top_broadcaster)
         except AttributeError:
             raise AttributeError("file {} did not contain a variable 'top_broadcaster'".format(rc))
+    freeze_registries()
+    return top_broadcasters
 
-    for fname in gc.options.files:
-        # Ignore temporary files
-        if fname.endswith('~'):
-            continue
-        for top_broadcaster in top_broadcasters:
-            with open(fname) as fstream:
-                lbc = top_broadcaster(fname, fstream, parent=None, gc=gc, disabled_rules=ignored_rules)
 
-    return gc.rs.error_count > 0
+def _lint_file(fname, top_broadcasters, gc, ignored_rules):
+    # Read each file once and replay it to every top broadcaster
+    with open(fname) as fstream:
+        try:
+            contents = fstream.read()
+        except UnicodeDecodeError as exc:
+            raise unicode_error(fname, exc)
+    for top_broadcaster in top_broadcasters:
+        top_broadcaster(fname, io.StringIO(contents), parent=None, gc=gc, disabled_rules=ignored_rules)
+
+
+def _run_file(fname, options, ignored_rules):
+    """Lint one file in a worker process and return its error count and messages."""
+    if "top_broadcasters" not in _worker_state:
+        _worker_state["top_broadcasters"] = _load_top_broadcasters(options.rule_config, ignored_rules)
+    gc = GlobalConfig(None, options=options, report_server_class=CollectingReportServer)
+    _lint_file(fname, _worker_state["top_broadcasters"], gc, ignored_rules)
+    return gc.rs.error_count, gc.rs.messages
 
 
 if __name__ == '__main__':
@@ -0,0 +1,99 @@
+"""Test LineBroadcaster.
+
+Both alternate constructors must broadcast the same lines for the same file.
+
+"""
+import codecs
+from collections import defaultdict
+import locale
+import os
+import tempfile
+import unittest
+
+from lw import base
+from lw import linebase
+
+# pylint: disable=too-few-public-methods,missing-docstring,unused-variable
+
+# Both constructors decode with the default encoding, \xff only fails to decode in UTF-8
+DEFAULT_ENCODING_IS_UTF8 = codecs.lookup(locale.getpreferredencoding(False)).name == "utf-8"
+
+
+class FromFilenameTestCase(unittest.TestCase):
+    """Compare from_filename_mmap against from_filename."""
+
+    def setUp(self):
+        # Reset the registry between tests
+        base.Broadcaster.listener_registry = defaultdict(list)
+        self.lines = []
+        lines = self.lines
+
+        class RecordingListener(linebase.LineListener):
+
+            def update_line(self, line_no, line):
+                lines.append((line_no, line))
+
+        fd, self.filename = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def _broadcast(self, contents, constructor):
+        with open(self.filename, "wb") as f:
+            f.write(contents)
+        del self.lines[:]
+        constructor(self.filename, gc=None, parent=None)
+        return list(self.lines)
+
+    def assertSameLines(self, contents, expected):
+        self.assertEqual(self._broadcast(contents, linebase.LineBroadcaster.from_filename), expected)
+        self.assertEqual(self._broadcast(contents, linebase.LineBroadcaster.from_filename_mmap), expected)
+
+    def test_lines(self):
+        """Every line is broadcast with its newline, including an unterminated last line."""
+        self.assertSameLines(b"a\nb\n\nc", [(0, "a\n"), (1, "b\n"), (2, "\n"), (3, "c")])
+
+    def test_crlf(self):
+        """CRLF and lone CR line endings are translated to LF."""
+        self.assertSameLines(b"a\r\nb\r\n", [(0, "a\n"), (1, "b\n")])
+        self.assertSameLines(b"a\rb\n", [(0, "a\n"), (1, "b\n")])
+        self.assertSameLines(b"a\r\rb\r\nc\r", [(0, "a\n"), (1, "\n"), (2, "b\n"), (3, "c\n")])
+
+    def test_empty_file(self):
+        """An empty file broadcasts nothing (mmap cannot map it)."""
+        self.assertSameLines(b"", [])
+
+    @unittest.skipUnless(DEFAULT_ENCODING_IS_UTF8, "Default encoding is not UTF-8")
+    def test_invalid_utf8(self):
+        """Undecodable files raise ValueError naming the file."""
+        self.assertRaisesRegex(ValueError, "There's unicode in", self._broadcast, b"a\n\xff\n",
+                               linebase.LineBroadcaster.from_filename_mmap)
+
+
+class EofTestCase(unittest.TestCase):
+    """Check the end of file callback to LineBroadcaster listeners."""
+
+    def setUp(self):
+        # Reset the registry between tests
+        base.Broadcaster.listener_registry = defaultdict(list)
+
+    def test_missing_eof_method(self):
+        """Throw error if a LineBroadcaster listener doesn't implement eof."""
+
+        class TestListener(base.Listener):
+            subscribe_to = [linebase.LineBroadcaster]
+
+            def update_line(self, line_no, line):
+                pass
+
+        self.assertRaisesRegex(base.IllegalListenerError,
+                               "subscribed to.*but does not have a eof method.",
+                               linebase.LineBroadcaster,
+                               "filename", ["a line\n"],
+                               gc=None,
+                               parent=None)
+
+
+if __name__ == '__main__':
+    unittest.main()
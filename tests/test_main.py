@@ -0,0 +1,99 @@
+"""Test that main reports the same errors serially and in worker processes."""
+from collections import defaultdict
+import io
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from mock import patch
+
+import main
+from lw import base
+
+# pylint: disable=missing-docstring
+
+RULE_CONFIG = """from lw import linebase
+top_broadcaster = linebase.LineBroadcaster
+"""
+
+NO_TABS_RULE = '''from lw import linebase
+
+
+class NoTabs(linebase.LineListener):
+    """Tabs are bad."""
+
+    def update_line(self, line_no, line):
+        if "\\t" in line:
+            self.error(line_no, line, "tab found")
+'''
+
+
+class JobsTestCase(unittest.TestCase):
+    """Run main with one, several and the default number of worker processes."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self._write("rules.py", RULE_CONFIG)
+        self._write("no_tabs.py", NO_TABS_RULE)
+        self.files = [
+            self._write("a.sv", "ok\n\tbad\nok\n"),
+            self._write("b.sv", "\tbad\nok\nalso\tbad\n"),
+            self._write("c.sv", "ok\n"),
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        for broadcaster_class in base.Broadcaster.listener_registry:
+            broadcaster_class._frozen_listeners = None
+        base.Broadcaster.listener_registry = defaultdict(list)
+        base._loaded.clear()
+        base._glob_cache.clear()
+
+    def _write(self, name, contents):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, "w") as f:
+            f.write(contents)
+        return path
+
+    def _run(self, jobs=None):
+        argv = ["main.py", "-m", "--rc", os.path.join(self.tmpdir, "rules.py")] + self.files
+        if jobs is not None:
+            argv += ["-j", str(jobs)]
+        stdout = io.StringIO()
+        with patch("sys.argv", argv), patch("sys.stdout", stdout):
+            try:
+                failed = main.main(argv)
+            finally:
+                logging.getLogger("lw").handlers.clear()
+        return failed, stdout.getvalue()
+
+    def test_parallel_matches_serial(self):
+        serial_failed, serial_output = self._run(jobs=1)
+        parallel_failed, parallel_output = self._run(jobs=2)
+        default_failed, default_output = self._run()
+
+        self.assertTrue(serial_failed)
+        self.assertTrue(parallel_failed)
+        self.assertTrue(default_failed)
+        self.assertEqual(parallel_output, serial_output)
+        self.assertEqual(default_output, serial_output)
+
+        violations = [line for line in serial_output.splitlines() if " violates " in line]
+        self.assertEqual(violations, [
+            "{}:1 violates NoTabs".format(self.files[0]),
+            "{} violates NoTabs".format(self.files[1]),
+            "{}:2 violates NoTabs".format(self.files[1]),
+        ])
+
+    def test_replay(self):
+        """Replayed errors add to the error count and are reported in order."""
+        server = main.CollectingReportServer()
+        server.replay(2, ["first", "second"])
+        server.replay(1, ["third"])
+        self.assertEqual(server.error_count, 3)
+        self.assertEqual(server.messages, ["first", "second", "third"])
+
+
+if __name__ == '__main__':
+    unittest.main()
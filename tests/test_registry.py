@@ -4,11 +4,15 @@ Ensures that the automatic registration of Listeners to appropriate
 Broadcasters occurs.
 
 """
+import os
+import shutil
+import tempfile
 import unittest
 from mock import MagicMock
 from collections import defaultdict
 
 from lw import base
+from lw import linebase
 
 # pylint: disable=too-few-public-methods,missing-docstring,unused-variable
 
@@ -32,6 +36,7 @@ class SubscriptionsTestCase(unittest.TestCase):
 
         class TestListener(base.Listener):
             subscribe_to = [TestBroadcaster]
+            update_test = MagicMock()
 
         self.assertIn(TestListener, TestBroadcaster.listener_registry[TestBroadcaster])
 
@@ -41,7 +46,6 @@ class SubscriptionsTestCase(unittest.TestCase):
         created_listener = tbc.listener_instances[0]
         self.assertTrue(isinstance(created_listener, TestListener))
 
-        created_listener.update_test = MagicMock()
         tbc.broadcast(1, "a line of text")
         created_listener.update_test.assert_called_with(1, "a line of text")
 
@@ -58,6 +62,7 @@ class SubscriptionsTestCase(unittest.TestCase):
 
         class Tier0Listener(base.Listener):
             subscribe_to = [Tier0Broadcaster]
+            update_tier0 = MagicMock()
 
         class Tier1Broadcaster(base.Broadcaster, base.Listener):
             subscribe_to = [Tier0Broadcaster]
@@ -69,10 +74,13 @@ class SubscriptionsTestCase(unittest.TestCase):
 
         class Tier1Listener(base.Listener):
             subscribe_to = [Tier1Broadcaster]
+            update_tier1 = MagicMock()
 
         class Tier01Listener(base.Listener):
             """Subscribes to both tier0 and tier1."""
             subscribe_to = [Tier0Broadcaster, Tier1Broadcaster]
+            update_tier0 = MagicMock()
+            update_tier1 = MagicMock()
 
         tier0_args = [1, 2, 3]
         tier1_args = [x * 2 for x in tier0_args]
@@ -85,10 +93,10 @@ class SubscriptionsTestCase(unittest.TestCase):
 
         self.assertIs(t01_li, t01_li_handle)
 
-        t0_li.update_tier0 = MagicMock()
-        t1_li.update_tier1 = MagicMock()
-        t01_li.update_tier0 = MagicMock()
-        t01_li.update_tier1 = MagicMock()
+        # Lookups resolve through the whole tree from any broadcaster
+        self.assertIs(t0_bc.get_listener("Tier1Listener"), t1_li)
+        self.assertIs(t1_bc.get_listener("Tier0Listener"), t0_li)
+        self.assertIsNone(t0_bc.get_listener("NoSuchListener"))
 
         t0_bc.broadcast(*tier0_args)
 
@@ -96,8 +104,8 @@ class SubscriptionsTestCase(unittest.TestCase):
         t01_li.update_tier1.assert_called_with(*tier1_args)
 
         # Check ignore
-        t01_li.update_tier0 = MagicMock() # Not sure how to reset these, so just creating new ones
-        t01_li.update_tier1 = MagicMock()
+        t01_li.update_tier0.reset_mock()
+        t01_li.update_tier1.reset_mock()
 
         t01_li._ignore(Tier0Broadcaster)
         t0_bc.broadcast(*tier0_args)
@@ -106,6 +114,56 @@ class SubscriptionsTestCase(unittest.TestCase):
         t01_li.update_tier0.assert_not_called()
         t01_li.update_tier1.assert_called_with(*tier1_args)
 
+        # Check pay attention restores the subscription
+        t0_bc.broadcast(*tier0_args)
+        t01_li.update_tier0.assert_called_with(*tier0_args)
+
+    def test_freeze_registries(self):
+        """Frozen registries are used until another Listener registers."""
+
+        class TestBroadcaster(base.Broadcaster):
+            pass
+
+        class TestListener(base.Listener):
+            subscribe_to = [TestBroadcaster]
+            update_test = MagicMock()
+
+        base.freeze_registries()
+        self.assertEqual(TestBroadcaster._frozen_listeners, (TestListener, ))
+        self.assertEqual(len(TestBroadcaster(gc=None, parent=None).listener_instances), 1)
+
+        class OtherListener(base.Listener):
+            subscribe_to = [TestBroadcaster]
+            update_test = MagicMock()
+
+        self.assertIsNone(TestBroadcaster._frozen_listeners)
+        self.assertEqual(len(TestBroadcaster(gc=None, parent=None).listener_instances), 2)
+
+    def test_rules_imported_once(self):
+        """Rule configs sharing a directory execute each file only once."""
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        self.addCleanup(base._glob_cache.clear)
+        self.addCleanup(base._loaded.clear)
+
+        listener_src = ("from lw import linebase\n"
+                        "class {0}(linebase.LineListener):\n"
+                        "    pass\n")
+        configs = []
+        for name in ["config_a", "config_b", "rule"]:
+            path = os.path.join(tmpdir, name + ".py")
+            with open(path, "w") as f:
+                f.write(listener_src.format(name.title().replace("_", "")))
+            configs.append(path)
+
+        # Mirror main: run each config, then glob the rules next to it
+        for config in configs[:2]:
+            base.import_rule_file(config)
+            base.glob_import_rules(config)
+
+        names = [listener.__name__ for listener in base.Broadcaster.listener_registry[linebase.LineBroadcaster]]
+        self.assertEqual(sorted(names), ["ConfigA", "ConfigB", "Rule"])
+
     @unittest.skip("Doesn't work when only inheriting from Broadcaster")
     def test_bad_broadcaster_name(self):
         """Create a Broadcaster with an illegal name.
@@ -191,12 +249,14 @@ class SubscriptionsTestCase(unittest.TestCase):
         class TestBroadcaster(base.Broadcaster):
             pass
 
-        class TestListener(base.Listener):
-            subscribe_to = [TestBroadcaster]
+        def create_bad_listener():
+
+            class TestListener(base.Listener):
+                subscribe_to = [TestBroadcaster]
 
-        tb = TestBroadcaster(gc=None, parent=None)
         self.assertRaisesRegex(base.IllegalListenerError, "subscribed to.*but does not have a update_test method.",
-                               tb.broadcast)
+                               create_bad_listener)
+        self.assertEqual(TestBroadcaster.listener_registry[TestBroadcaster], [])
 
 
 if __name__ == '__main__':